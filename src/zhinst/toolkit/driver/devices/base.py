@@ -6,13 +6,13 @@ the device specific nodetree.
 
 from __future__ import annotations
 
-import copy
 import json
 import logging
 import re
 import typing as t
 import warnings
-from functools import cached_property
+from enum import Enum
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 from zhinst.core import __version__ as zhinst_version_str
@@ -27,6 +27,79 @@ logger = logging.getLogger(__name__)
 if t.TYPE_CHECKING:  # pragma: no cover
     from zhinst.toolkit.session import Session
 
+# Preloaded node docs use a placeholder instead of the device serial. It is
+# only resolved per matched node instead of substituting it in the whole file.
+_SERIAL_PLACEHOLDER = "/devxxxx/"
+
+_NODE_PLACEHOLDER_RE = re.compile(r"\/n(?=\/|$)")
+
+# Masks for the STATUSFLAGS of a device in /zi/devices
+_FW_UPDATING = 1 << 8
+_FW_MISMATCH_FW = (1 << 4) | (1 << 5)
+_FW_MISMATCH_LABONE = (1 << 6) | (1 << 7)
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+class _DeviceFamily(Enum):
+    """Device families that require a special handling in the base driver.
+
+    The value is the prefix of the device types belonging to the family.
+    """
+
+    HF2 = "HF2"
+    OTHER = ""
+
+
+def _classify_device_type(device_type: str) -> _DeviceFamily:
+    """Get the device family of a device type.
+
+    Args:
+        device_type: Type of the device (e.g. HF2LI).
+
+    Returns:
+        Device family.
+    """
+    for family in _DeviceFamily:
+        if family.value and device_type.startswith(family.value):
+            return family
+    return _DeviceFamily.OTHER
+
+
+def _normalize_node(node: str) -> str:
+    """Map a concrete node path to the generic node path of a preloaded node doc.
+
+    All numeric indices are replaced by ``n``, except the index of a
+    ``values`` node, e.g. /dev1234/demods/0/rate -> /dev1234/demods/n/rate.
+
+    Args:
+        node: Lower case node path.
+
+    Returns:
+        Generic node path.
+    """
+    parts = node.split("/")
+    for i in range(1, len(parts)):
+        if parts[i].isdigit() and parts[i - 1] != "values":
+            parts[i] = "n"
+    return "/".join(parts)
+
+
+@lru_cache(maxsize=4)
+def _load_nodedoc(filename: str) -> dict:
+    """Load a static node doc json file.
+
+    The result is cached and shared between all instruments and must
+    therefore not be modified.
+
+    Args:
+        filename: Path to the json file.
+
+    Returns:
+        Parsed node doc.
+    """
+    return json.loads(Path(filename).read_bytes())
+
 
 class BaseInstrument(Node):
     """Generic toolkit driver for a Zurich Instrument device.
@@ -51,27 +124,39 @@ class BaseInstrument(Node):
         session: Session,
     ):
         self._serial = serial
+        self._serial_lower = serial.lower()
+        self._serial_upper = serial.upper()
+        self._path_prefix = f"/{serial}"
         self._device_type = device_type
+        self._device_family = _classify_device_type(device_type)
         self._session = session
-        try:
-            self._options = session.daq_server.getString(f"/{serial}/features/options")
-        except RuntimeError:
-            self._options = ""
+        self._streaming_nodes: t.Optional[tuple[Node, ...]] = None
+        self._compat_checked = False
+        # The nodetree is created on first access (see ``_nodetree``)
+        super().__init__(None, ())  # type: ignore[arg-type]
 
+    @cached_property
+    def _nodetree(self) -> NodeTree:
+        """Nodetree of the instrument.
+
+        Creating the nodetree requires the node information of the device,
+        therefore it is only done when a node is accessed for the first time.
+
+        Returns:
+            Nodetree of the instrument.
+        """
         # HF2 does not support listNodesJSON so we have the information hardcoded
         # (the node of HF2 will not change any more so this is safe)
         preloaded_json = None
-        if "HF2" in self._device_type:
+        if self._device_family is _DeviceFamily.HF2:
             preloaded_json = self._load_preloaded_json(
                 Path(__file__).parent / "../../resources/nodedoc_hf2.json",
             )
 
-        self._streaming_nodes: t.Optional[list[Node]] = None
-
         nodetree = NodeTree(
             self._session.daq_server,
             prefix_hide=self._serial,
-            list_nodes=[f"/{self._serial}/*"],
+            list_nodes=[self._path_prefix + "/*"],
             preloaded_json=preloaded_json,
         )
         # Add predefined parseres (in node_parser) to nodetree nodes
@@ -79,8 +164,17 @@ class BaseInstrument(Node):
             node_parser.get(self.__class__.__name__, {}),
             raise_for_invalid_node=False,
         )
+        return nodetree
+
+    @property
+    def _root(self) -> NodeTree:  # type: ignore[override]
+        return self._nodetree
 
-        super().__init__(nodetree, ())
+    @_root.setter
+    def _root(self, value: t.Optional[NodeTree]) -> None:
+        # ``Node.__init__`` passes None since the nodetree is created lazily
+        if value is not None:
+            self._nodetree = value
 
     def __repr__(self):
         options = f"({self._options})" if self._options else ""
@@ -107,13 +201,14 @@ class BaseInstrument(Node):
         self.system.preset.load(1, deep=deep)
         self.system.preset.busy.wait_for_state_change(0, timeout=timeout)
         if self.system.preset.error(deep=True)[1]:
-            msg = f"Failed to load factory preset to device {self.serial.upper()}."
+            msg = f"Failed to load factory preset to device {self._serial_upper}."
             raise ToolkitError(
                 msg,
             )
-        logger.info(f"Factory preset is loaded to device {self.serial.upper()}.")
+        logger.info(f"Factory preset is loaded to device {self._serial_upper}.")
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def _version_string_to_tuple(version: str) -> tuple[int, int, int, int]:
         """Converts a version string into a version tuple.
 
@@ -126,11 +221,27 @@ class BaseInstrument(Node):
             Version as a tuple of ints, where the patch version is set to 0
             if it is missing.
         """
-        parts = version.split(".")
+        # Single pass over the string, parts that are not a number become 0
+        parts: list[int] = []
+        value = 0
+        is_number = True
+        for char in version:
+            if char == ".":
+                parts.append(value if is_number else 0)
+                if len(parts) == 4:
+                    break
+                value = 0
+                is_number = True
+            elif is_number and "0" <= char <= "9":
+                value = value * 10 + ord(char) - 48
+            else:
+                is_number = False
+        else:
+            parts.append(value if is_number else 0)
         if len(parts) == 3:
             # The patch version is optional, so we insert a 0
-            parts.insert(2, "0")
-        return tuple(int(v) if v.isdigit() else 0 for v in parts[:4])  # type: ignore
+            parts.insert(2, 0)
+        return tuple(parts)  # type: ignore[return-value]
 
     @staticmethod
     def _check_python_versions(
@@ -227,11 +338,15 @@ class BaseInstrument(Node):
             ToolkitError: If the firmware revision does not match to the
                 version of the connected LabOne DataServer.
         """
-        device_info = json.loads(self._session.daq_server.getString("/zi/devices"))[
-            self.serial.upper()
-        ]
+        devices = self._session.daq_server.getString("/zi/devices")
+        # Only decode the entry of this device instead of all discovered devices
+        match = re.search(rf'"{re.escape(self._serial_upper)}"\s*:\s*', devices)
+        if match:
+            device_info = _JSON_DECODER.raw_decode(devices, match.end())[0]
+        else:
+            device_info = json.loads(devices)[self._serial_upper]
         status_flag = device_info["STATUSFLAGS"]
-        if status_flag & 1 << 8:
+        if status_flag & _FW_UPDATING:
             msg = (
                 "The device is currently updating please try again after the update "
                 "process is complete"
@@ -239,7 +354,7 @@ class BaseInstrument(Node):
             raise ConnectionError(
                 msg,
             )
-        if status_flag & 1 << 4 or status_flag & 1 << 5:
+        if status_flag & _FW_MISMATCH_FW:
             msg = (
                 "The Firmware does not match the LabOne version. "
                 "Please update the firmware (e.g. in the LabOne UI)"
@@ -247,7 +362,7 @@ class BaseInstrument(Node):
             raise ToolkitError(
                 msg,
             )
-        if status_flag & 1 << 6 or status_flag & 1 << 7:
+        if status_flag & _FW_MISMATCH_LABONE:
             msg = (
                 "The Firmware does not match the LabOne version. "
                 "Please update LabOne to the latest version from "
@@ -268,11 +383,15 @@ class BaseInstrument(Node):
             * zhinst package matches the LabOne Data Server version
             * firmware revision matches the LabOne Data Server version
 
+        The check is only performed until it succeeded once for the instrument.
+
         Raises:
             ConnectionError: If the device is currently updating
             ToolkitError: If one of the above mentioned criterion is not
                 fulfilled
         """
+        if self._compat_checked:
+            return
         self._check_python_versions(
             self._version_string_to_tuple(zhinst_version_str),
             self._version_string_to_tuple(utils_version_str),
@@ -292,6 +411,7 @@ class BaseInstrument(Node):
             self._version_string_to_tuple(labone_full_version),
         )
         self._check_firmware_update_status()
+        self._compat_checked = True
 
     def get_streamingnodes(self) -> list[Node]:
         """Create a list with all streaming nodes available.
@@ -300,11 +420,12 @@ class BaseInstrument(Node):
             Available streaming node.
         """
         if self._streaming_nodes is None:
-            self._streaming_nodes = []
-            for node, info in self:
-                if "Stream" in info.get("Properties"):
-                    self._streaming_nodes.append(node)
-        return self._streaming_nodes
+            self._streaming_nodes = tuple(
+                self._root.raw_path_to_node(raw_node)
+                for raw_node in self._root.properties_index.get("Stream", ())
+            )
+        # Return a copy so that the cached nodes can not be modified
+        return list(self._streaming_nodes)
 
     def _load_preloaded_json(self, filename: Path) -> t.Optional[dict]:
         """Load a preloaded json and match the existing nodes.
@@ -317,26 +438,40 @@ class BaseInstrument(Node):
         """
         if not filename.is_file():
             return None
-        raw_file = filename.open("r").read()
-
-        raw_file = raw_file.replace("devxxxx", self.serial.lower())
-        raw_file = raw_file.replace("DEVXXXX", self.serial.upper())
-        json_raw = json.loads(raw_file)
-
-        existing_nodes = self._session.daq_server.listNodes(
-            f"/{self.serial}/*",
-            recursive=True,
-            leavesonly=True,
-        )
+        json_raw = _load_nodedoc(str(filename))
+        serial_prefix = f"/{self._serial_lower}/"
+
+        if any(_NODE_PLACEHOLDER_RE.search(node) for node in json_raw):
+            # The number of indexed nodes (e.g. demods) depends on the device
+            # and its options and can only be resolved by the device itself.
+            existing_nodes = self._session.daq_server.listNodes(
+                self._path_prefix + "/*",
+                recursive=True,
+                leavesonly=True,
+            )
+        else:
+            existing_nodes = [
+                (
+                    serial_prefix + node[len(_SERIAL_PLACEHOLDER) :]
+                    if node.startswith(_SERIAL_PLACEHOLDER)
+                    else node
+                )
+                for node in json_raw
+            ]
 
         preloaded_json = {}
         for node in existing_nodes:
-            node_name = re.sub(r"(?<!values)\/[0-9]*?$", "/n", node.lower())
-            node_name = re.sub(r"\/[0-9]*?\/", "/n/", node_name)
-            json_element = copy.deepcopy(json_raw.get(node_name))
+            node_lower = node.lower()
+            node_name = _normalize_node(node_lower)
+            if node_name.startswith(serial_prefix):
+                node_name = _SERIAL_PLACEHOLDER + node_name[len(serial_prefix) :]
+            # Only the top level "Node" entry is modified, so a shallow copy
+            # is sufficient to keep the cached node doc unchanged.
+            raw_element = json_raw.get(node_name)
+            json_element = dict(raw_element) if raw_element else None
             if json_element:
                 json_element["Node"] = node.upper()
-                preloaded_json[node.lower()] = json_element
+                preloaded_json[node_lower] = json_element
             elif not node.startswith("/zi/"):
                 logger.warning(f"unkown node {node}")
 
@@ -391,6 +526,22 @@ class BaseInstrument(Node):
         """
         return self._device_type
 
+    @cached_property
+    def _options(self) -> str:
+        """Raw options string of the instrument.
+
+        Only fetched from the data server when needed (e.g. by ``__repr__``).
+
+        Returns:
+            Device options or an empty string if they are not available.
+        """
+        try:
+            return self._session.daq_server.getString(
+                self._path_prefix + "/features/options",
+            )
+        except RuntimeError:
+            return ""
+
     @cached_property
     def device_options(self) -> str:
         """Enabled options of the instrument.
@@ -399,3 +550,14 @@ class BaseInstrument(Node):
             Device options.
         """
         return self.features.options()
+
+    @cached_property
+    def _device_options_set(self) -> frozenset[str]:
+        """Enabled options of the instrument as a set.
+
+        Allows a fast and exact lookup of a single option.
+
+        Returns:
+            Device options.
+        """
+        return frozenset(self.device_options.replace(",", "\n").split())
@@ -25,7 +25,7 @@ class UHFLI(BaseInstrument):
         Returns:
             A list of AWG Cores or a single AWG Core node.
         """
-        if "AWG" not in self.features.options():
+        if "AWG" not in self._device_options_set:
             logger.error("Missing option: AWG")
             return Node(
                 self._root,
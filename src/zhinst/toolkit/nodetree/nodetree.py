@@ -212,7 +212,7 @@ class NodeTree:
         if not list_nodes:
             list_nodes = ["*"]
         self._flat_dict: NodeDoc = {}
-        if preloaded_json:
+        if preloaded_json is not None:
             self._flat_dict = preloaded_json
         else:
             for element in list_nodes:
@@ -225,6 +225,7 @@ class NodeTree:
         self._first_layer: list[str] = []
         self._prefixes_keep: list[str] = []
         self._node_infos: dict[Node, NodeInfo] = {}
+        self._properties_index: t.Optional[dict[str, list[str]]] = None
         self._generate_first_layer()
 
     def __getattr__(self, name):
@@ -376,6 +377,7 @@ class NodeTree:
             for single_key in keys:
                 self._flat_dict[single_key].update(updates)
         self._node_infos = {}
+        self._properties_index = None
 
     def update_nodes(
         self,
@@ -572,6 +574,27 @@ class NodeTree:
         """
         return self._prefix_hide
 
+    @property
+    def properties_index(self) -> dict[str, list[str]]:
+        """Raw node paths grouped by their properties.
+
+        The index is created on first access and reset whenever the nodetree
+        is updated.
+
+        Returns:
+            Dictionary with the property (e.g. "Stream") as keys and a list of
+            all raw node paths that have this property as values.
+        """
+        if self._properties_index is None:
+            self._properties_index = {}
+            for raw_node, info in self._flat_dict.items():
+                for node_property in info.get("Properties", "").split(","):
+                    self._properties_index.setdefault(
+                        node_property.strip(),
+                        [],
+                    ).append(raw_node)
+        return self._properties_index
+
     @property
     def raw_dict(self) -> dict:
         """Underlying flat dictionary with all node information.
@@ -56,7 +56,10 @@ def shfqa(data_dir, mock_connection, session):
         autospec=True,
     ) as max_qubits:
         max_qubits.return_value = 16
-        yield SHFQA("DEV1234", "SHFQA4", session)
+        device = SHFQA("DEV1234", "SHFQA4", session)
+        # Create the nodetree while the mocked nodedoc belongs to this device
+        device.root
+        yield device
 
 
 @pytest.fixture
@@ -67,7 +70,10 @@ def shfsg(data_dir, mock_connection, session):
     mock_connection.return_value.listNodesJSON.return_value = nodes_json
 
     mock_connection.return_value.getString.return_value = ""
-    return SHFSG("DEV1234", "SHFSG8", session)
+    device = SHFSG("DEV1234", "SHFSG8", session)
+    # Create the nodetree while the mocked nodedoc belongs to this device
+    device.root
+    return device
 
 
 @pytest.fixture
@@ -78,7 +84,10 @@ def shfqc(data_dir, mock_connection, session):
     mock_connection.return_value.listNodesJSON.return_value = nodes_json
 
     mock_connection.return_value.getString.return_value = ""
-    return SHFQC("DEV1234", "SHFQC", session)
+    device = SHFQC("DEV1234", "SHFQC", session)
+    # Create the nodetree while the mocked nodedoc belongs to this device
+    device.root
+    return device
 
 
 @pytest.fixture
@@ -7,7 +7,12 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from zhinst.toolkit._min_version import _MIN_DEVICE_UTILS_VERSION, _MIN_LABONE_VERSION
-from zhinst.toolkit.driver.devices.base import BaseInstrument
+from zhinst.toolkit.driver.devices.base import (
+    BaseInstrument,
+    _classify_device_type,
+    _DeviceFamily,
+    _normalize_node,
+)
 from zhinst.toolkit.exceptions import ToolkitError
 
 
@@ -24,6 +29,8 @@ def test_instrument_session_property(base_instrument, session):
 
 
 def test_basic_setup(mock_connection, base_instrument):
+    # the nodetree is only created on first access
+    assert base_instrument.demods[0].rate
     mock_connection.return_value.listNodesJSON.assert_called_with(
         f"/{base_instrument.serial}/*",
     )
@@ -33,6 +40,42 @@ def test_basic_setup(mock_connection, base_instrument):
     assert repr(base_instrument) == "BaseInstrument(test_type(OptionA),DEV1234)"
 
 
+def test_nodetree_lazy(mock_connection, session, nodedoc_dev1234_json):
+    mock_connection.return_value.listNodesJSON.reset_mock()
+    mock_connection.return_value.listNodesJSON.return_value = nodedoc_dev1234_json
+    instrument = BaseInstrument("DEV1234", "test_type", session)
+    mock_connection.return_value.listNodesJSON.assert_not_called()
+
+    assert instrument.serial == "DEV1234"
+    assert instrument.device_type == "test_type"
+    mock_connection.return_value.listNodesJSON.assert_not_called()
+
+    assert instrument.root is instrument.root
+    mock_connection.return_value.listNodesJSON.assert_called_once_with("/DEV1234/*")
+
+
+def test_options_lazy(mock_connection, base_instrument):
+    mock_connection.return_value.getString.assert_not_called()
+    assert repr(base_instrument) == "BaseInstrument(test_type(OptionA),DEV1234)"
+    assert repr(base_instrument) == "BaseInstrument(test_type(OptionA),DEV1234)"
+    mock_connection.return_value.getString.assert_called_once_with(
+        "/DEV1234/features/options",
+    )
+
+
+def test_options_unavailable(mock_connection, base_instrument):
+    mock_connection.return_value.getString.side_effect = RuntimeError()
+    assert repr(base_instrument) == "BaseInstrument(test_type,DEV1234)"
+
+
+def test_device_options(mock_connection, base_instrument):
+    mock_connection.return_value.getString.return_value = "MF\nPID\nMFK"
+    assert base_instrument.device_options == "MF\nPID\nMFK"
+    assert base_instrument._device_options_set == frozenset(["MF", "PID", "MFK"])
+    assert "MF" in base_instrument._device_options_set
+    assert "M" not in base_instrument._device_options_set
+
+
 def test_hf2_setup(data_dir, mock_connection, hf2_session):
     list_nodes_path = data_dir / "list_nodes_hf2_dev.txt"
     with list_nodes_path.open("r", encoding="UTF-8") as file:
@@ -45,6 +88,41 @@ def test_hf2_setup(data_dir, mock_connection, hf2_session):
     assert instrument.device_type == "HF2LI"
     assert instrument.serial == "DEV1234"
     assert repr(instrument) == "BaseInstrument(HF2LI(OptionA),DEV1234)"
+    assert instrument.demods[1].rate.node_info.path == "/dev1234/demods/1/rate"
+    assert instrument.auxins[0].values[1].node_info.unit == "V"
+
+
+def test_hf2_setup_multiple_devices(data_dir, mock_connection, hf2_session):
+    list_nodes_path = data_dir / "list_nodes_hf2_dev.txt"
+    with list_nodes_path.open("r", encoding="UTF-8") as file:
+        nodes_dev = file.read().split("\n")[:-1]
+
+    mock_connection.return_value.listNodes.return_value = nodes_dev
+    instrument_a = BaseInstrument("DEV1234", "HF2LI", hf2_session)
+    assert instrument_a.root
+    mock_connection.return_value.listNodes.return_value = [
+        node.replace("DEV1234", "DEV4321") for node in nodes_dev
+    ]
+    instrument_b = BaseInstrument("DEV4321", "HF2LI", hf2_session)
+
+    assert instrument_b.demods[0].rate.node_info.path == "/dev4321/demods/0/rate"
+    assert instrument_a.demods[0].rate.node_info.path == "/dev1234/demods/0/rate"
+    instrument_b.root.update_node("demods/0/rate", {"Unit": "test"})
+    assert instrument_a.demods[0].rate.node_info.unit == "Hz"
+
+
+@pytest.mark.parametrize(
+    ("device_type", "family"),
+    [
+        ("HF2LI", _DeviceFamily.HF2),
+        ("HF2IS", _DeviceFamily.HF2),
+        ("MFLI", _DeviceFamily.OTHER),
+        ("SHFQC", _DeviceFamily.OTHER),
+        ("", _DeviceFamily.OTHER),
+    ],
+)
+def test_classify_device_type(device_type, family):
+    assert _classify_device_type(device_type) is family
 
 
 def test_factory_reset_ok(base_instrument, mock_connection):
@@ -97,6 +175,10 @@ def test_get_streamingnodes(base_instrument):
     assert base_instrument.dios[0].input in nodes
     assert base_instrument.scopes[0].wave in nodes
     assert base_instrument.demods[0].sample in nodes
+    assert base_instrument.demods[0].rate not in nodes
+
+    nodes.clear()
+    assert base_instrument.get_streamingnodes()
 
 
 def test_set_transaction(base_instrument):
@@ -140,6 +222,36 @@ def test_load_preloaded_json(base_instrument, mock_connection, data_dir):
     assert len(return_value) == 0
 
 
+@pytest.mark.parametrize(
+    ("node", "expected"),
+    [
+        ("/dev1234/clockbase", "/dev1234/clockbase"),
+        ("/dev1234/demods/0/rate", "/dev1234/demods/n/rate"),
+        ("/dev1234/stats/12", "/dev1234/stats/n"),
+        ("/dev1234/auxins/1/values/0", "/dev1234/auxins/n/values/0"),
+        ("/dev1234/a/0/b/1/c", "/dev1234/a/n/b/n/c"),
+    ],
+)
+def test_normalize_node(node, expected):
+    assert _normalize_node(node) == expected
+
+
+def test_load_preloaded_json_without_index(base_instrument, mock_connection, tmp_path):
+    nodedoc = {
+        "/zi/about/version": {"Node": "/ZI/ABOUT/VERSION"},
+        "/devxxxx/system/fwrevision": {"Node": "/DEVXXXX/SYSTEM/FWREVISION"},
+    }
+    nodedoc_path = tmp_path / "nodedoc.json"
+    nodedoc_path.write_text(json.dumps(nodedoc))
+
+    return_value = base_instrument._load_preloaded_json(nodedoc_path)
+    mock_connection.return_value.listNodes.assert_not_called()
+    assert return_value == {
+        "/zi/about/version": {"Node": "/ZI/ABOUT/VERSION"},
+        "/dev1234/system/fwrevision": {"Node": "/DEV1234/SYSTEM/FWREVISION"},
+    }
+
+
 def test_check_python_versions():
     sub = lambda x, y: tuple(map(operator.sub, x, y))
     add = lambda x, y: tuple(map(operator.add, x, y))
@@ -182,6 +294,14 @@ def test_version_string_to_tuple_dev():
     assert test_version == (25, 1, 0, 0)
 
 
+def test_version_string_to_tuple_short():
+    # Minimum versions only consist of major and minor version and are compared
+    # against the first two elements of a full version.
+    test_version = BaseInstrument._version_string_to_tuple("22.2")
+    assert test_version == (22, 2)
+    assert (22, 2, 0, 0)[:2] >= test_version
+
+
 def test_version_string_to_tuple_invalid():
     test_version = BaseInstrument._version_string_to_tuple("25.1.3.2586.4.8.d")
     assert test_version == (25, 1, 3, 2586)
@@ -279,6 +399,12 @@ def test_check_firmware_update_status(base_instrument, mock_connection):
     with pytest.raises(ConnectionError):
         base_instrument._check_firmware_update_status()
 
+    # Device not found
+    info = {"DEV1111": {}, "DEV12345": {"STATUSFLAGS": 0}}
+    mock_connection.return_value.getString.return_value = json.dumps(info)
+    with pytest.raises(KeyError):
+        base_instrument._check_firmware_update_status()
+
 
 def test_check_compatibility(base_instrument):
 
@@ -298,3 +424,31 @@ def test_check_compatibility(base_instrument):
                 check_python_versions.assert_called_once()
                 check_labone_version.assert_called_once()
                 check_firmware_update_status.assert_called_once()
+
+                # successful check is not repeated
+                base_instrument.check_compatibility()
+                check_python_versions.assert_called_once()
+                check_labone_version.assert_called_once()
+                check_firmware_update_status.assert_called_once()
+
+
+def test_check_compatibility_failure(base_instrument):
+    with patch(
+        "zhinst.toolkit.driver.devices.base.BaseInstrument._check_python_versions",
+        new_callable=MagicMock,
+    ):
+        with patch(
+            "zhinst.toolkit.driver.devices.base.BaseInstrument._check_labone_version",
+            new_callable=MagicMock,
+        ):
+            with patch(
+                "zhinst.toolkit.driver.devices.base.BaseInstrument._check_firmware_update_status",
+                new_callable=MagicMock,
+            ) as check_firmware_update_status:
+                check_firmware_update_status.side_effect = ToolkitError()
+                with pytest.raises(ToolkitError):
+                    base_instrument.check_compatibility()
+                # failed check is repeated
+                with pytest.raises(ToolkitError):
+                    base_instrument.check_compatibility()
+                assert check_firmware_update_status.call_count == 2
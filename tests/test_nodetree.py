@@ -83,6 +83,13 @@ def test_init_preloaded_json(nodedoc_dev1234_json):
     connection.listNodesJSON.mock_object.assert_not_called()
 
 
+def test_init_preloaded_json_empty():
+    connection = MagicMock()
+    tree = NodeTree(connection, prefix_hide="DEV1234", preloaded_json={})
+    connection.listNodesJSON.assert_not_called()
+    assert tree.raw_dict == {}
+
+
 def test_to_raw_path(connection):
     tree = NodeTree(connection)
 
@@ -771,6 +778,21 @@ def test_update_nodes(connection):
     assert tree.testNOtexists.is_valid() is False
 
 
+def test_properties_index(connection):
+    tree = NodeTree(connection, "DEV1234")
+
+    streaming_nodes = tree.properties_index["Stream"]
+    assert "/dev1234/demods/0/sample" in streaming_nodes
+    assert "/dev1234/demods/0/rate" not in streaming_nodes
+    assert "/dev1234/demods/0/rate" in tree.properties_index["Setting"]
+    assert tree.properties_index is tree.properties_index
+
+    # the index is reset when the nodetree is updated
+    tree.update_node("demods/0/rate", {"Properties": "Read, Stream"})
+    assert "/dev1234/demods/0/rate" in tree.properties_index["Stream"]
+    assert "/dev1234/demods/0/rate" not in tree.properties_index["Setting"]
+
+
 def test_options(connection):
     tree = NodeTree(connection, "DEV1234")
 
@@ -15,7 +15,10 @@ def pqsc(data_dir, mock_connection, session):
     mock_connection.return_value.listNodesJSON.return_value = nodes_json
     mock_connection.return_value.getString.return_value = ""
 
-    return PQSC("DEV1234", "PQSC", session)
+    device = PQSC("DEV1234", "PQSC", session)
+    # Create the nodetree while the mocked nodedoc belongs to this device
+    device.root
+    return device
 
 
 def test_repr(pqsc):
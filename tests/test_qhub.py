@@ -15,7 +15,10 @@ def qhub(data_dir, mock_connection, session):
     mock_connection.return_value.listNodesJSON.return_value = nodes_json
     mock_connection.return_value.getString.return_value = ""
 
-    return QHub("DEV1234", "QHUB", session)
+    device = QHub("DEV1234", "QHUB", session)
+    # Create the nodetree while the mocked nodedoc belongs to this device
+    device.root
+    return device
 
 
 def test_repr(qhub):